@@ -1,12 +1,26 @@
 import json
 from dataclasses import dataclass, fields
-from functools import partial
+from functools import cache, partial
 from pydoc import locate
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 bundleclass = partial(dataclass, frozen=True, eq=True, kw_only=True)
 
 PREFIX = '__bundle_class.'
 
+@cache
+def _locate(clspath):
+    """
+    pydoc.locate, memoized. Resolving a dotted path imports
+    and walks each segment, which adds up when decoding many
+    bundles of the same class.
+    """
+    return locate(clspath)
+
 def from_dict(value):
     if (
         isinstance(value, dict)
@@ -15,27 +29,57 @@ def from_dict(value):
     ):
         (key, val), = value.items()
         clspath = key[len(PREFIX):]
-        return locate(clspath)(**{k: from_dict(v) for k, v in val.items()})
+        return _locate(clspath)(**{k: from_dict(v) for k, v in val.items()})
     return value
 
+if orjson is not None:
+    _ORJSON_OPTS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+    )
+
+def _dumps(value):
+    """
+    Encode value as a json string, using orjson when installed.
+    orjson's output is compact and writes NaN and inf as null.
+    Values it cannot encode (e.g. ints above 64 bits) are left
+    to json.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=_ORJSON_OPTS).decode()
+        except TypeError:
+            # orjson.JSONEncodeError is a subclass of TypeError.
+            pass
+    return json.dumps(value)
+
 def from_json(json_str):
     return from_dict(json.loads(json_str))
 
+@cache
+def _layout(cls):
+    """
+    The bundle key and field names of a Bundle subclass.
+    Computed once per class, since dataclass fields are
+    fixed after class creation.
+    """
+    name = '.'.join((cls.__module__, cls.__qualname__))
+    return PREFIX + name, tuple(f.name for f in fields(cls))
+
     
 @bundleclass
 class Bundle:
     def _asdict(self):
-        cls = self.__class__
+        bundle_key, field_names = _layout(self.__class__)
         args = {}
-        for f in fields(self):
-            key = f.name
-            val = getattr(self, f.name)
+        for key in field_names:
+            val = getattr(self, key)
             if isinstance(val, Bundle):
                 args[key] = val._asdict()
             else:
                 args[key] = val
-        name = '.'.join((cls.__module__, cls.__qualname__))
-        return {PREFIX + name: args}
+        return {bundle_key: args}
 
     def tojson(self):
-        return json.dumps(self._asdict())
+        return _dumps(self._asdict())
@@ -1,12 +1,14 @@
 import copy
-from collections import defaultdict
+from collections import defaultdict, deque
 from collections.abc import MutableSet
 from dataclasses import dataclass
-from typing import Any, Generic, TypeVar
-from unittest.mock import sentinel
+from typing import AbstractSet, Any, Generic, TypeVar
 
 T = TypeVar('T')
 
+# Shared neighbor set for nodes without neighbors in one direction.
+_EMPTY: frozenset = frozenset()
+
 
 class OrderedSet(MutableSet[T], Generic[T]):
     def __init__(self, iterable=()):
@@ -42,10 +44,11 @@ class OrderedSet(MutableSet[T], Generic[T]):
         return f"OrderedSet({list(self._data)!r})"
 
 
-@dataclass(frozen=True, eq=True)
+@dataclass(frozen=True, eq=True, slots=True)
 class Directed:
     """
-    Superclass of Left and Right. Used for graph.edges.
+    Superclass of Left and Right. Used to pick a direction
+    in graph.pop and graph.pops (e.g. graph.pop(Left(x))).
     This is just a hack for discriminating unions. i.e.
     Directed a = Left a | Right a
     """
@@ -58,7 +61,7 @@ class Directed:
     def flipped(self):
         return self.opposite(self.val)
 
-@dataclass(frozen=True, eq=True)
+@dataclass(frozen=True, eq=True, slots=True)
 class Left(Directed):
     """
     Left subclass of Directed.
@@ -67,7 +70,7 @@ class Left(Directed):
     def opposite(cls, val):
         return Right(val)
 
-@dataclass(frozen=True, eq=True)
+@dataclass(frozen=True, eq=True, slots=True)
 class Right(Directed):
     """
     Right subclass of Directed.
@@ -76,55 +79,59 @@ class Right(Directed):
     def opposite(cls, val):
         return Left(val)
 
-@dataclass(frozen=True, eq=True)
+@dataclass(frozen=True, eq=True, slots=True)
 class NodeInfo:
     """
     Bundle of neighbors for a node.
 
     `left` and `right` preserve the insertion order from graph construction.
     For task DAGs, that means `left` preserves the dependency order returned by
-    `requires()`.
+    `requires()`. Missing neighbors are represented by an empty frozenset.
     """
-    left: OrderedSet[Any]
-    right: OrderedSet[Any]
+    left: AbstractSet[Any]
+    right: AbstractSet[Any]
 
 class Graph(object):
     """
     Directed graph.
-    Stores edges and their directions in an edgemap.
-    Uses two root sentinel nodes (leftmost and rightmost)
-    to account for nodes without (non-root) edges.
+    Stores its nodes, and its edges in two adjacency maps keyed by node:
+    `left[l]` holds every r such that l -> r, and
+    `right[r]` holds every l such that l -> r.
     """
     def __init__(self):
         """
         Initialize an empty graph.
         """
-        self.edges = defaultdict(OrderedSet)
-        self.leftmost = Left(sentinel.leftmost)
-        self.rightmost = Right(sentinel.rightmost)
-        self._add(self.leftmost, self.rightmost)
+        self.nodes = OrderedSet()
+        self.left = defaultdict(OrderedSet)
+        self.right = defaultdict(OrderedSet)
     
-    def _add(self, L: Left, R: Right):
+    def _add(self, l, r):
+        """
+        l: Left node
+        r: Right node
+        adds the edge l -> r to the edge maps.
+        """
+        self.left[l].add(r)
+        self.right[r].add(l)
+
+    def _remove(self, l, r):
         """
-        L: Left node
-        R: Right node
-        adds an edge to the edge map.
+        l: Left node
+        r: Right node
+        removes the edge l -> r from the edge maps,
+        dropping neighbor sets that become empty.
         """
-        #assert isinstance(L, Left), f'{L} is not Left'
-        #assert isinstance(R, Right), f'{R} is not Right'
-        self.edges[L].add(R.val)
-        self.edges[R].add(L.val)
-
-    def _remove(self, L: Left, R: Right):
-        #assert isinstance(L, Left), f'{L} is not Left'
-        #assert isinstance(R, Right), f'{R} is not Right'
-        self.edges[L].discard(R.val)
-        self.edges[R].discard(L.val)
-
-        if not self.edges[L]:
-            del self.edges[L]
-        if not self.edges[R]:
-            del self.edges[R]
+        rs = self.left.get(l)
+        if rs is not None:
+            rs.discard(r)
+            if not rs:
+                del self.left[l]
+        ls = self.right.get(r)
+        if ls is not None:
+            ls.discard(l)
+            if not ls:
+                del self.right[r]
 
     def add(self, l, r=None):
         """
@@ -133,26 +140,11 @@ class Graph(object):
 
         graph.add(l) adds l as a single node.
         graph.add(l, r) adds l -> r as an edge in the graph.
-
-        (Also keeps track of internal root nodes leftmost and rightmost)
         """
-        if r is None and not self.has(l):
-            self._add(self.leftmost, Right(l))
-            self._add(Left(l), self.rightmost)
-        elif r is not None:
-            L = Left(l)
-            R = Right(r)
-
-            self._add(L, R)
-
-            # Add anchors
-            if L.flipped() not in self.edges:
-                self._add(self.leftmost, L.flipped())
-            if R.flipped() not in self.edges:
-                self._add(R.flipped(), self.rightmost)
-            # Discard anchors
-            self._remove(self.leftmost, R)
-            self._remove(L, self.rightmost)
+        self.nodes.add(l)
+        if r is not None:
+            self.nodes.add(r)
+            self._add(l, r)
 
     def get(self, node):
         """
@@ -160,7 +152,6 @@ class Graph(object):
         returns: NodeInfo
 
         Get the neighbors of a node (and their corresponding directions).
-        Does not include the sentinel nodes. 
         ```
         nbh = self.graph.get(x)
         for l in nbh.left:
@@ -169,52 +160,41 @@ class Graph(object):
             x -> r in graph
         ```
         """
-        if Right(node) in self.edges:
-            left = OrderedSet(
-                x for x in self.edges[Right(node)] if x != self.leftmost.val
-            )
-        else:
-            left = OrderedSet()
-        if Left(node) in self.edges:
-            right = OrderedSet(
-                x for x in self.edges[Left(node)] if x != self.rightmost.val
-            )
-        else:
-            right = OrderedSet()
+        left = self.right.get(node)
+        right = self.left.get(node)
         return NodeInfo(
-                left = left,
-                right = right,
+                left = left.copy() if left else _EMPTY,
+                right = right.copy() if right else _EMPTY,
                 )
 
     def empty(self):
-        return not bool(self.edges)
+        return not bool(self.nodes)
 
-    def has(self, x, which=Left):
+    def has(self, x):
         """
         x: Any
-        which: Left | Right
+        Checks if x is a node in the graph.
         """
-        return which(x) in self.edges
+        return x in self.nodes
 
     def pop(self, x):
         """
         x: Left | Right
         Pop an edge from x
 
-        (And removes empty sets from edges)
+        (And removes empty sets from the edge maps)
         """
-        if x not in self.edges:
-            raise KeyError
-
-        y = x.opposite(self.edges[x].pop())
-        assert x.val in self.edges[y]
-        self.edges[y].discard(x.val)
-
-        if not self.edges[y]: # if child has no parents: remove it
-            del self.edges[y]
-        if not self.edges[x]: # if parent has no children: remove it
-            del self.edges[x]
-        return y.val
+        if isinstance(x, Left):
+            if x.val not in self.left:
+                raise KeyError
+            y = self.left[x.val].pop()
+            self._remove(x.val, y)
+        else:
+            if x.val not in self.right:
+                raise KeyError
+            y = self.right[x.val].pop()
+            self._remove(y, x.val)
+        return y
     
     def pops(self, x):
         """
@@ -232,57 +212,39 @@ class Graph(object):
         Copy this graph (does a shallow copy of the nodes)
         """
         ret = Graph()
-        ret.leftmost = self.leftmost
-        ret.rightmost = self.rightmost
-        for l, r in self.edges.items():
-            ret.edges[l] = copy.copy(r)
+        ret.nodes = copy.copy(self.nodes)
+        for l, rs in self.left.items():
+            ret.left[l] = copy.copy(rs)
+        for r, ls in self.right.items():
+            ret.right[r] = copy.copy(ls)
         return ret
 
-    def root(self, direction=Left):
-        """
-        Get the sentinel root of the specified direction.
-        """
-        return self.leftmost.val if direction is Left else self.rightmost.val
-
-    def kahns(self, direction=Left, pure=True):
-        """
-        direction: Direction
-        pure: if pure = False, edges will be removed from the graph.
-        yields a topological sort of nodes.
-        Will end prematurely if the graph contains cycles.
-        """
-        gen = self._kahns(direction, pure)
-        roots = next(gen)
-        while roots:
-            n = roots.pop()
-            roots.update(gen.send(n))
-            yield n
-
-    def _kahns(self, direction=Left, pure=True):
-        graph = self.copy() if pure else self
-        roots = {self.leftmost.val} if direction is Left else {self.rightmost.val}
-        n = yield roots
-        while True:
-            new_roots = set()
-            for child in graph.pops(direction(n)):
-                if direction.opposite(child) not in graph.edges:
-                    new_roots.add(child)
-            n = yield new_roots
-
-    def toposort(self, pure=True):
+    def toposort(self):
         """
-        pure: if pure = False, edges will be removed from the graph.
-        yields a topological sort of nodes.
+        Returns a topological sort of nodes (Kahn's algorithm).
+        The graph is left untouched.
         Raises value error if there are cycles in the graph.
         """
-        tmp = self.copy() if pure else self
-        sorted = list(tmp.kahns(pure=False))
-        if not tmp.empty():
+        indegree = {n: len(self.right.get(n, _EMPTY)) for n in self.nodes}
+
+        ready = deque(n for n, d in indegree.items() if d == 0)
+        sorted = []
+        while ready:
+            n = ready.popleft()
+            sorted.append(n)
+            for child in self.left.get(n, ()):
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+
+        if len(sorted) < len(indegree):
             lines = ['']
-            for l, rs in tmp.edges.items():
-                lines.append(f'{l.val}')
-                for r in rs:
-                    lines.append(f'\t=> {r}')
+            for n, d in indegree.items():
+                if d > 0:
+                    lines.append(f'{n}')
+                    for r in self.left.get(n, ()):
+                        if indegree[r] > 0:
+                            lines.append(f'\t=> {r}')
             lines = '\n'.join(lines)
             raise ValueError(f'Cycles detected: {lines}')
         return sorted
@@ -1,17 +1,25 @@
-from asyncio import Condition
+import asyncio
 from collections import Counter
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 
 from waluigi.errors import ResourceError
 
+# Shared result of as_ctr() without arguments. Must never be mutated.
+_EMPTY_CTR: Counter = Counter()
+
 
 def as_ctr(*args, **kwargs):
     """
     Helper function to construct Counter from *args, **kwargs.
     Takes either a Counter as input, or kwargs with counts.
     i.e. either `as_ctr(Counter(A=2,B=3))` or `as_ctr(A=2, B=3)`
+
+    Calling it without arguments returns a shared empty Counter,
+    so the result should be treated as read-only.
     """
+    if not args and not kwargs:
+        return _EMPTY_CTR
     match args, kwargs:
         case [Counter() as ctr], {}:
             pass
@@ -21,6 +29,14 @@ def as_ctr(*args, **kwargs):
             raise ValueError("Type failure")
     return ctr
 
+def fits(requirement, supply):
+    """
+    Checks `requirement <= supply` for Counters with non-negative
+    counts. Unlike Counter.__le__, only the keys of requirement are
+    visited, which keeps the check cheap for large resource pools.
+    """
+    return all(supply[k] >= n for k, n in requirement.items())
+
 
 class Resources:
     """
@@ -43,8 +59,10 @@ class Resources:
     """
     def __init__(self, *args, **kwargs):
         self.used = Counter()
-        self.available = as_ctr(*args, **kwargs)
-        self.cond = Condition()
+        # Copied, as the pool is mutated in place (and as_ctr() may
+        # return the shared empty Counter).
+        self.available = Counter(as_ctr(*args, **kwargs))
+        self.waiters = []
 
     @classmethod
     async def init(cls, *args, **kwargs):
@@ -63,22 +81,46 @@ class Resources:
     def total(self):
         return self.used + self.available
 
+    def _take(self, requirement):
+        self.used.update(requirement)
+        self.available.subtract(requirement)
+
+    def _give(self, resources):
+        self.used.subtract(resources)
+        self.available.update(resources)
+
+    def _dispatch(self):
+        """
+        Hand out available resources to waiting requests, in the
+        order they were made. Only the requests that fit are woken;
+        the others keep waiting, without blocking those behind them.
+        """
+        waiting = []
+        for requirement, fut in self.waiters:
+            if fut.done():
+                # The request was cancelled while waiting.
+                continue
+            if fits(requirement, self.available):
+                self._take(requirement)
+                fut.set_result(requirement)
+            else:
+                waiting.append((requirement, fut))
+        self.waiters = waiting
+
     async def notify(self):
-        async with self.cond:
-            self.cond.notify_all()
+        self._dispatch()
 
     async def return_resources(self, *args, **kwargs):
         """
         Return resources to the supply.
         """
         resources = as_ctr(*args, **kwargs)
-        if not (resources <= self.used):
+        if not fits(resources, self.used):
             raise ResourceError(
                 'Returning resources not in use: {resources} </= {self.used}'
             )
         if resources:
-            self.used -= resources
-            self.available += resources
+            self._give(resources)
             await self.notify()
 
     async def add_resources(self, *args, **kwargs):
@@ -87,20 +129,33 @@ class Resources:
         """
         resources = as_ctr(*args, **kwargs)
         if resources:
-            self.available += resources
+            self.available.update(resources)
             await self.notify()
 
     async def request_resources(self, *args, **kwargs):
         requirement = as_ctr(*args, **kwargs)
-        if not (requirement <= self.total()):
+        if not requirement:
+            # Most tasks request no resources at all.
+            return requirement
+        used, available = self.used, self.available
+        if not all(used[k] + available[k] >= n for k, n in requirement.items()):
             raise ResourceError(
                 f"Requested incompatible resources: {requirement} </= {self.total()}"
             )
-        if requirement:
-            async with self.cond:
-                await self.cond.wait_for(lambda: requirement <= self.available)
-                self.used += requirement
-                self.available -= requirement
+        if fits(requirement, available):
+            self._take(requirement)
+            return requirement
+
+        fut = asyncio.get_running_loop().create_future()
+        self.waiters.append((requirement, fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if not fut.cancelled():
+                # Resources were handed out just before the cancellation.
+                self._give(requirement)
+                self._dispatch()
+            raise
         return requirement
     
     @asynccontextmanager
@@ -119,7 +174,7 @@ class Resources:
         finally:
             await allocation.release_all()
 
-@dataclass
+@dataclass(slots=True)
 class Allocation:
     acquired: Counter
     supply: Resources
@@ -152,7 +207,8 @@ class Allocation:
         total available resources.
         """
         req = await self.supply.request_resources(*args, **kwargs)
-        self.acquired += req
+        if req:
+            self.acquired = self.acquired + req
 
     async def release(self, *args, **kwargs):
         """
@@ -165,6 +221,7 @@ class Allocation:
             ...
         """
         part = as_ctr(*args, **kwargs)
-        assert part <= self.acquired
-        self.acquired -= part
+        assert fits(part, self.acquired)
+        if part:
+            self.acquired = self.acquired - part
         await self.supply.return_resources(part)
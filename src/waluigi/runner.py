@@ -1,4 +1,5 @@
 import asyncio
+from functools import partial
 from types import SimpleNamespace
 
 from waluigi import logger
@@ -8,28 +9,57 @@ from waluigi.resources import Resources
 from waluigi.task import Task, TaskWithCleanup
 
 
+def mk_task_factory():
+    """
+    Returns the function run_dag uses to create asyncio tasks.
+    On Python >= 3.12 tasks are started eagerly, so tasks that are
+    already done, or whose dependencies are, finish without being
+    scheduled on the event loop. The loop's own task factory is left
+    untouched.
+    """
+    eager_task_factory = getattr(asyncio, 'eager_task_factory', None)
+    if eager_task_factory is None:
+        return asyncio.create_task
+    return partial(eager_task_factory, asyncio.get_running_loop())
+
 async def mk_context(resources={}, **kwargs):
     r = await Resources.init(**resources)
     return SimpleNamespace(resources=r, **kwargs)
 
-def add_task(graph: Graph, task: Task):
+def add_task(graph: Graph, task: Task, done=None):
     """
     add_task(graph, task) adds a task and all of its
-    dependencies to the graph, recursively.
+    dependencies to the graph.
     Tasks that are already done are added as dependencies,
-    to tasks that depend on them, but their dependencies 
+    to tasks that depend on them, but their dependencies
     are not added.
+
+    The dependencies are walked with an explicit stack,
+    so deep pipelines do not hit the recursion limit.
+
+    done: optional dict memoizing task.done() results. Shared
+    tasks (e.g. in diamond-shaped DAGs) are then only checked once,
+    which matters when done() stats files.
     """
-    def inner(parent):
+    if done is None:
+        done = {}
+
+    def is_done(t):
+        if t not in done:
+            done[t] = t.done()
+        return done[t]
+
+    if is_done(task) or graph.has(task):
+        return
+    graph.add(task)
+    stack = [task]
+    while stack:
+        parent = stack.pop()
         for child in parent._requires():
-            recurse = not (child.done() or graph.has(child))
+            expand = not (is_done(child) or graph.has(child))
             graph.add(child, parent)
-            if recurse:
-                inner(child)
-
-    if not (task.done() or graph.has(task)):
-        inner(task)
-        graph.add(task)
+            if expand:
+                stack.append(child)
 
 def mk_dag(*tasks):
     """
@@ -44,12 +74,10 @@ def mk_dag(*tasks):
     when the DAG was constructed.
     """
     graph = Graph()
+    done = {}
     for task in tasks:
-        add_task(graph, task)
-    leftmost, *sorted, rightmost = graph.toposort()
-    assert rightmost == graph.rightmost.val
-    assert leftmost == graph.leftmost.val
-    return [(val, graph.get(val)) for val in sorted]
+        add_task(graph, task, done)
+    return [(val, graph.get(val)) for val in graph.toposort()]
 
 async def run_dag(task_edges, context):
     """
@@ -65,29 +93,35 @@ async def run_dag(task_edges, context):
     runs = {}
     cleanups = {}
     done = 0
+    # Local bindings for the scheduling loops, which visit every task.
+    create_task = mk_task_factory()
+    get_run = runs.__getitem__
+    with_cleanup = []
     for (task, edges) in task_edges:
-        if task.done():
-            runs[task] = asyncio.create_task(task.noop())
+        # done() is checked once per task and reused for its cleanup.
+        is_done = task.done()
+        if is_done:
+            runs[task] = create_task(task.noop())
             done += 1
         else:
-            deps = [runs[l] for l in edges.left]
-            runs[task] = asyncio.create_task(task._run_after(context, *deps))
-
-    for (task, edges) in task_edges:
+            deps = map(get_run, edges.left)
+            runs[task] = create_task(task._run_after(context, *deps))
         if isinstance(task, TaskWithCleanup):
-            deps = [runs[r] for r in edges.right]
-            if not task.done():
-                deps += [runs[task]]
-            cleanups[task] = asyncio.create_task(task._cleanup_after(context, *deps))
+            with_cleanup.append((task, edges, is_done))
+
+    # Cleanups await their dependents, which are only scheduled
+    # once the loop above has visited the whole DAG.
+    for (task, edges, is_done) in with_cleanup:
+        deps = list(map(get_run, edges.right))
+        if not is_done:
+            deps.append(runs[task])
+        cleanups[task] = create_task(task._cleanup_after(context, *deps))
     
     logger.info('Tasks scheduled, starting run')
-    results = await asyncio.gather(
-        *runs.values(),
-        *cleanups.values(),
-        return_exceptions=True,
+    run_results, clean_results = await asyncio.gather(
+        asyncio.gather(*runs.values(), return_exceptions=True),
+        asyncio.gather(*cleanups.values(), return_exceptions=True),
     )
-    run_results = results[: len(runs.values())]
-    clean_results = results[len(runs.values()) :]
     log_results(done, run_results, clean_results)
 
 def log_results(done, run_results, clean_results):
@@ -1,10 +1,39 @@
+import itertools
+import os
+import socket
 from contextlib import contextmanager, nullcontext
 from dataclasses import field
+from functools import cached_property
 from pathlib import Path
-from uuid import uuid4
 
 from waluigi.bundle import Bundle, bundleclass
 
+# Temporary file ids are {host}-{pid}-{counter}: unique across
+# the processes sharing a filesystem, without reading entropy.
+_HOST = socket.gethostname()
+_tmp_counter = itertools.count()
+
+# Default buffer size for LocalTarget.open in write mode.
+WRITE_BUFFERING = 1 << 20
+
+
+def fsync(path):
+    """
+    Flush the file (or directory) at path to disk.
+    Files are opened for writing, since os.fsync rejects read-only
+    descriptors on Windows. Directories can only be opened read-only,
+    and are skipped where they cannot be opened at all (no O_DIRECTORY).
+    """
+    if not os.path.isdir(path):
+        fd = os.open(path, os.O_RDWR)
+    elif hasattr(os, 'O_DIRECTORY'):
+        fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    else:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
 @bundleclass
 class Target(Bundle):
@@ -34,31 +63,48 @@ class NoTarget(Target):
     def exists(self) -> bool:
         return False
 
+class _Unset(object):
+    """
+    Marker for a Wrapped object without a value.
+    Pickles (and copies) to the module-level _UNSET singleton,
+    so identity checks keep working after a round-trip.
+    """
+    __slots__ = ()
+
+    def __reduce__(self):
+        return '_UNSET'
+
+    def __repr__(self):
+        return '<unset>'
+
+_UNSET = _Unset()
+
 class Wrapped(object):
     """
     A wrapper around a value, used by memory-targets.
     """
+    __slots__ = ('val',)
+
     def __init__(self):
-        pass
+        self.val = _UNSET
 
     def set(self, val):
-        if hasattr(self, 'val'):
+        if self.val is not _UNSET:
             raise AttributeError('Trying to set wrapped object twice')
         self.val = val
 
     def get(self):
-        try:
-            return self.val
-        except AttributeError:
+        val = self.val
+        if val is _UNSET:
             raise AttributeError(
                 'Trying to get wrapped object without setting it first'
             )
+        return val
 
     def delete(self):
-        try:
-            del self.val
-        except AttributeError:
+        if self.val is _UNSET:
             raise AttributeError('Trying to delete unset wrapped object')
+        self.val = _UNSET
 
 @bundleclass
 class MemoryTarget(Target):
@@ -102,14 +148,21 @@ class LocalTarget(Target):
     force: if force, this target will never be 
     considered as existing. i.e. the corresponding
     task will be run and the old file overwritten.
+    durable: if durable, written files are fsynced before
+    being moved into place, and the directory after, so
+    that a crash cannot leave behind a file that exists
+    but is empty or truncated. This costs two syncs per write,
+    plus one per file and subdirectory of a directory output.
     """
     file: str
     force: bool = False
+    durable: bool = False
 
-    @property
+    @cached_property
     def path(self):
         """
         returns self.file as a pathlib.Path.
+        Computed once per target, since self.file is frozen.
         """
         return Path(self.file)
 
@@ -117,22 +170,31 @@ class LocalTarget(Target):
         return self.path.exists() and (not self.force)
 
     @contextmanager
-    def open(self, mode='r'):
+    def open(self, mode='r', buffering=None):
         """
         Get a handle to the file. 
         If writing, the handle points to a temporary file
         that is moved to self.file on exit (see LocalTarget.tmp_path)
+
+        buffering is passed on to the builtin open. If None, writes
+        use a WRITE_BUFFERING sized buffer, which cuts the number of
+        write syscalls for large outputs, and reads use the builtin
+        default (-1), which can also be asked for explicitly.
         """
         if mode.startswith('r'):
             path_context = nullcontext(self.path)
+            if buffering is None:
+                buffering = -1
         elif mode.startswith('w'):
             path_context = self.tmp_path()
+            if buffering is None:
+                buffering = WRITE_BUFFERING
         else:
             raise ValueError(f'{mode} not a valid open mode')
 
         with (
                 path_context as path,
-                open(path, mode) as handle,
+                open(path, mode, buffering) as handle,
                 ):
             yield handle
 
@@ -140,14 +202,35 @@ class LocalTarget(Target):
     def tmp_path(self):
         """
         Context manager that yields a temporary path.
-        The temporary path is moved to self.file on exit.
+        The temporary path is moved to self.file on exit,
+        replacing any existing file. If the body raises,
+        whatever was written is kept as self.file-FAILED-*.
         """
-        rid = uuid4()
+        rid = f'{_HOST}-{os.getpid()}-{next(_tmp_counter)}'
         tmp_path = Path(f'{self.file}-TMP-{rid}')
-        tmp_path.parent.mkdir(exist_ok=True, parents=True)
+        # Checking first costs one stat when the directory exists,
+        # where mkdir(exist_ok=True) would fail a mkdir and then stat.
+        if not tmp_path.parent.is_dir():
+            tmp_path.parent.mkdir(exist_ok=True, parents=True)
+        moved = False
         try:
             yield tmp_path
-            tmp_path.rename(self.file)
+            if self.durable and tmp_path.is_dir():
+                # Directory outputs (e.g. partitioned datasets) are
+                # synced bottom-up: files, then the directories holding them.
+                for root, _, files in os.walk(tmp_path, topdown=False):
+                    for name in files:
+                        fsync(os.path.join(root, name))
+                    fsync(root)
+            elif self.durable:
+                fsync(tmp_path)
+            os.replace(tmp_path, self.file)
+            moved = True
+            if self.durable:
+                fsync(tmp_path.parent)
         finally:
-            if tmp_path.exists():
-                tmp_path.rename(f'{self.file}-FAILED-{rid}')
+            if not moved:
+                try:
+                    os.replace(tmp_path, f'{self.file}-FAILED-{rid}')
+                except FileNotFoundError:
+                    pass
@@ -8,6 +8,22 @@ from waluigi.errors import FailedDependency, FailedRun
 from waluigi.target import MemoryTarget, NoTarget, Target
 
 
+async def _gather(tasks):
+    """
+    asyncio.gather for scheduler tasks. If every task has already
+    finished (e.g. dependencies that were done when the DAG was
+    scheduled), the results are collected directly, without a
+    round-trip through the event loop. A single pending task is
+    awaited directly rather than wrapped in a gathering future.
+    Raises the first exception, like asyncio.gather.
+    """
+    if all(t.done() for t in tasks):
+        return [t.result() for t in tasks]
+    if len(tasks) == 1:
+        return [await tasks[0]]
+    return await asyncio.gather(*tasks)
+
+
 @bundleclass
 class Task(Bundle):
     """
@@ -79,7 +95,7 @@ class Task(Bundle):
         **noop** is used by the scheduler if the task
         was *done* during scheduling.
         """
-        logger.info(f'{self} already done.')
+        logger.info('%s already done.', self)
         return self
 
     def done(self):
@@ -102,8 +118,8 @@ class Task(Bundle):
         """
         if tasks:
             try:
-                logger.info(f'{self} awaiting dependencies.')
-                results = await asyncio.gather(*tasks)
+                logger.info('%s awaiting dependencies.', self)
+                results = await _gather(tasks)
             except Exception as e:
                 logger.exception('dependency failure:')
                 raise FailedDependency(self) from e
@@ -111,15 +127,15 @@ class Task(Bundle):
             results = []
         try:
             inputs = [x.output() for x in results]
-            logger.info(f'{self} awaiting allocation.')
+            logger.info('%s awaiting allocation.', self)
             async with context.resources.get_allocation(
                 **self.resources()
             ) as allocation:
                 inner_context = copy.copy(context)
                 inner_context.allocation = allocation
-                logger.info(f'{self} run started.')
+                logger.info('%s run started.', self)
                 await self.run_async(inner_context, *inputs)
-                logger.info(f'Run {self} done.')
+                logger.info('Run %s done.', self)
             return self
         except Exception as e:
             logger.exception('run failure:')
@@ -184,14 +200,14 @@ class TaskWithCleanup(Task):
         if tasks:
        
             try:
-                logger.info(f'Cleanup {self} waiting.')
-                await asyncio.gather(*tasks)
+                logger.info('Cleanup %s waiting.', self)
+                await _gather(tasks)
             except Exception as e:
                 raise FailedDependency(self) from e
         try:
-            logger.info(f'Cleanup {self} entered.')
+            logger.info('Cleanup %s entered.', self)
             await self.cleanup_async(context)
-            logger.info(f'Cleanup {self} done.')
+            logger.info('Cleanup %s done.', self)
             return self
         except Exception as e:
             raise FailedRun(self) from e
@@ -0,0 +1,49 @@
+import json
+import math
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from waluigi import bundle
+from waluigi.bundle import Bundle, bundleclass, from_json
+
+
+@bundleclass
+class Params(Bundle):
+    value: object
+
+
+@bundleclass
+class Outer(Bundle):
+    inner: Params
+    name: str
+
+
+class BundleJsonRegressionTests(unittest.TestCase):
+    @unittest.skipIf(bundle.orjson is None, "orjson is not installed")
+    def test_orjson_and_json_backends_decode_equal(self):
+        values = [
+            {1: "a", 2.5: "b", None: "c", False: "d"},
+            2**70,
+            [-(2**64), 2**63],
+            [1e16, 1e-7, 1.5e300, -2.5e-300],
+            None,
+            ["ünïcode", "☃", {"nested": [1, 2.5, False]}],
+        ]
+        for value in values:
+            b = Outer(inner=Params(value=value), name="x")
+            with self.subTest(value=value):
+                fast = b.tojson()
+                with mock.patch.object(bundle, "orjson", None):
+                    slow = b.tojson()
+                self.assertEqual(from_json(fast), from_json(slow))
+
+    def test_json_backend_output_is_unchanged(self):
+        b = Outer(inner=Params(value=[math.nan, 1e16, "é"]), name="x")
+        with mock.patch.object(bundle, "orjson", None):
+            encoded = b.tojson()
+        self.assertEqual(encoded, json.dumps(b._asdict()))
+        self.assertTrue(math.isnan(from_json(encoded).inner.value[0]))
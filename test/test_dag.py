@@ -1,3 +1,4 @@
+import asyncio
 import sys
 import tempfile
 import unittest
@@ -26,6 +27,14 @@ class CycleB(Task):
         return CycleA()
 
 
+@bundleclass
+class Chain(Task):
+    depth: int
+
+    def requires(self):
+        return [Chain(depth=self.depth - 1)] if self.depth else []
+
+
 @bundleclass
 class ValueTask(Task):
     name: str
@@ -86,6 +95,23 @@ class Consumer(Task):
         self.output().set("done")
 
 
+@bundleclass
+class SlowCleanup(TaskWithCleanup):
+    name: str
+    mem: MemoryTarget = field(default_factory=MemoryTarget, compare=False)
+
+    def output(self):
+        return self.mem
+
+    def run(self):
+        self.output().set(self.name)
+
+    async def cleanup_async(self, context):
+        EVENTS.append(f"cleanup-start:{self.name}")
+        await asyncio.sleep(0.01)
+        EVENTS.append(f"cleanup-end:{self.name}")
+
+
 EVENTS: List[str] = []
 
 
@@ -107,6 +133,14 @@ class RunnerRegressionTests(unittest.IsolatedAsyncioTestCase):
         with self.assertRaisesRegex(ValueError, "Cycles detected"):
             mk_dag(CycleA())
 
+    def test_mk_dag_handles_dependency_chains_deeper_than_recursion_limit(self):
+        depth = sys.getrecursionlimit() + 100
+        dag = mk_dag(Chain(depth=depth))
+
+        self.assertEqual(len(dag), depth + 1)
+        self.assertEqual(dag[0][0], Chain(depth=0))
+        self.assertEqual(dag[-1][0], Chain(depth=depth))
+
     async def test_run_dag_uses_frozen_dependency_order(self):
         task = OrderedConsumer(reverse=False)
         dag = mk_dag(task)
@@ -135,3 +169,16 @@ class RunnerRegressionTests(unittest.IsolatedAsyncioTestCase):
         await run_dag(dag, context)
 
         self.assertEqual(EVENTS, ["produce", "consume:payload", "cleanup"])
+
+    async def test_independent_cleanups_run_concurrently(self):
+        dag = mk_dag(SlowCleanup(name="a"), SlowCleanup(name="b"))
+        context = await mk_context()
+
+        await run_dag(dag, context)
+
+        self.assertEqual(
+            sorted(EVENTS[:2]), ["cleanup-start:a", "cleanup-start:b"]
+        )
+        self.assertEqual(
+            sorted(EVENTS[2:]), ["cleanup-end:a", "cleanup-end:b"]
+        )
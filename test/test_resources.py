@@ -0,0 +1,56 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from waluigi.resources import Resources
+
+
+class ResourcesRegressionTests(unittest.IsolatedAsyncioTestCase):
+    async def test_waiting_request_is_granted_when_resources_return(self):
+        resources = await Resources.init(gpu=2)
+        first = await resources.request_resources(gpu=2)
+
+        waiter = asyncio.create_task(resources.request_resources(gpu=1))
+        await asyncio.sleep(0)
+        self.assertFalse(waiter.done())
+
+        await resources.return_resources(first)
+        self.assertEqual(await waiter, {"gpu": 1})
+        self.assertEqual(resources.available["gpu"], 1)
+
+    async def test_small_request_is_not_blocked_by_larger_waiter(self):
+        resources = await Resources.init(gpu=2)
+        await resources.request_resources(gpu=1)
+
+        large = asyncio.create_task(resources.request_resources(gpu=2))
+        await asyncio.sleep(0)
+        small = await resources.request_resources(gpu=1)
+
+        self.assertEqual(small, {"gpu": 1})
+        self.assertFalse(large.done())
+        large.cancel()
+
+    async def test_cancelled_waiter_does_not_leak_resources(self):
+        resources = await Resources.init(gpu=1)
+        first = await resources.request_resources(gpu=1)
+
+        waiter = asyncio.create_task(resources.request_resources(gpu=1))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+
+        await resources.return_resources(first)
+        self.assertEqual(resources.available["gpu"], 1)
+        self.assertEqual(resources.used["gpu"], 0)
+
+    async def test_adding_to_empty_pool_does_not_share_state(self):
+        resources = await Resources.init()
+        await resources.add_resources(gpu=1)
+
+        self.assertEqual(resources.available["gpu"], 1)
+        self.assertEqual((await Resources.init()).available, {})
+        self.assertEqual(await resources.request_resources(gpu=1), {"gpu": 1})
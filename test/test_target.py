@@ -0,0 +1,129 @@
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from waluigi.target import WRITE_BUFFERING, LocalTarget, MemoryTarget
+
+
+class LocalTargetRegressionTests(unittest.TestCase):
+    @contextmanager
+    def record_sync_calls(self):
+        """
+        Patch os.fsync and os.replace to record, in order, the inode
+        of each synced descriptor and the destination of each replace.
+        """
+        calls = []
+        real_fsync, real_replace = os.fsync, os.replace
+
+        def record_fsync(fd):
+            calls.append(("fsync", os.fstat(fd).st_ino))
+            real_fsync(fd)
+
+        def record_replace(src, dst):
+            calls.append(("replace", Path(dst)))
+            real_replace(src, dst)
+
+        with (
+            mock.patch("os.fsync", side_effect=record_fsync),
+            mock.patch("os.replace", side_effect=record_replace),
+        ):
+            yield calls
+
+    def test_durable_write_moves_file_into_place(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "sub" / "out.txt"
+            target = LocalTarget(file=str(path), durable=True)
+            with self.record_sync_calls() as calls:
+                with target.open("wt") as handle:
+                    handle.write("payload")
+
+            # The file is synced before it is moved into place, and the
+            # directory entry after.
+            expected = [("fsync", path.stat().st_ino), ("replace", path)]
+            if hasattr(os, "O_DIRECTORY"):
+                expected.append(("fsync", path.parent.stat().st_ino))
+            self.assertEqual(calls, expected)
+            self.assertTrue(target.exists())
+            self.assertEqual(target.path.read_text(), "payload")
+            self.assertEqual(list(target.path.parent.iterdir()), [target.path])
+
+    @unittest.skipUnless(hasattr(os, "O_DIRECTORY"), "directories cannot be synced")
+    def test_durable_directory_write(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "dataset"
+            target = LocalTarget(file=str(path), durable=True)
+            with self.record_sync_calls() as calls:
+                with target.tmp_path() as tmp:
+                    (tmp / "part=0").mkdir(parents=True)
+                    (tmp / "part=0" / "data.parquet").write_text("rows")
+
+            # Contents are synced bottom-up before the move, and the
+            # parent directory after.
+            expected = [
+                ("fsync", (path / "part=0" / "data.parquet").stat().st_ino),
+                ("fsync", (path / "part=0").stat().st_ino),
+                ("fsync", path.stat().st_ino),
+                ("replace", path),
+                ("fsync", Path(tmpdir).stat().st_ino),
+            ]
+            self.assertEqual(calls, expected)
+            self.assertEqual(list(Path(tmpdir).iterdir()), [path])
+
+    def test_failed_write_is_moved_aside(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            target = LocalTarget(file=str(Path(tmpdir) / "out.txt"))
+            with self.assertRaises(RuntimeError):
+                with target.open("wt") as handle:
+                    handle.write("partial")
+                    raise RuntimeError("task failed")
+
+            self.assertFalse(target.exists())
+            failed = list(Path(tmpdir).glob("out.txt-FAILED-*"))
+            self.assertEqual(len(failed), 1)
+            self.assertEqual(failed[0].read_text(), "partial")
+
+    def test_write_replaces_existing_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            target = LocalTarget(file=str(Path(tmpdir) / "out.txt"), force=True)
+            target.path.write_text("old")
+            with target.open("wt") as handle:
+                handle.write("new")
+
+            self.assertEqual(target.path.read_text(), "new")
+
+    def test_buffering_defaults_and_overrides(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            target = LocalTarget(file=str(Path(tmpdir) / "out.txt"), force=True)
+            cases = [
+                ("wt", None, WRITE_BUFFERING),
+                ("wt", -1, -1),
+                ("wb", 0, 0),
+                ("rt", None, -1),
+            ]
+            for mode, buffering, expected in cases:
+                with (
+                    self.subTest(mode=mode, buffering=buffering),
+                    mock.patch("builtins.open", wraps=open) as mock_open,
+                ):
+                    with target.open(mode, buffering=buffering):
+                        pass
+                    self.assertEqual(mock_open.call_args.args[2], expected)
+
+
+class MemoryTargetRegressionTests(unittest.TestCase):
+    def test_unset_value_survives_pickling(self):
+        target = pickle.loads(pickle.dumps(MemoryTarget()))
+
+        with self.assertRaisesRegex(AttributeError, "without setting"):
+            target.get()
+        target.set("payload")
+        self.assertEqual(target.get(), "payload")
+        with self.assertRaisesRegex(AttributeError, "twice"):
+            target.set("again")